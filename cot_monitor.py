@@ -7,17 +7,46 @@ sends weekly reports via n8n webhook.
 Based on: Swing Trading Strategy Framework (Verified Traders Roundtable)
 """
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import csv
+import functools
+import gzip
+import io
 import json
+import logging
 import os
+import stat
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import sys
 
+try:
+    import orjson  # Optional: faster JSON decoding/encoding
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit  # Optional: JIT-compiles the signal kernel
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
+# Log level is set with the COT_LOG environment variable (default INFO)
+logger = logging.getLogger('cot')
+
 CONFIG_FILE = "config.json"
 
 # Default configuration (override with config.json)
@@ -57,36 +86,123 @@ DEFAULT_CONFIG = {
     },
     "lookback": {
         "divergence_weeks": 52,
-        "extreme_weeks": 156
+        "extreme_weeks": 156,
+        "recent_window": 26,
+        "older_window": 26
     }
 }
 
-# CFTC Socrata API endpoint
-CFTC_API_URL = "https://publicreporting.cftc.gov/resource/gpe5-46if.json"
+# CFTC Socrata API endpoint (CSV is far smaller on the wire than JSON)
+CFTC_API_URL = "https://publicreporting.cftc.gov/resource/gpe5-46if.csv"
+
+# Columns requested from the API
+COT_FIELDS = "report_date_as_yyyy_mm_dd,contract_market_name,lev_money_positions_long,lev_money_positions_short,nonrept_positions_long_all,nonrept_positions_short_all"
+
+# Local cache of API responses, one file per CFTC code
+CACHE_DIR = ".cot_cache"
+
+# Upper bound on concurrent fallback fetches
+MAX_FETCH_WORKERS = 8
+
+# ============================================================================
+# HTTP SESSION
+# ============================================================================
+
+def create_session() -> requests.Session:
+    """
+    Build a keep-alive HTTP session shared by all API and webhook calls.
+    Reusing connections avoids a fresh TCP+TLS handshake per asset.
+    """
+    session = requests.Session()
+    session.headers.update({
+        'Accept': 'text/csv, application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'User-Agent': 'COT-Monitor/1.0'
+    })
+    
+    # Retry transient failures with exponential backoff instead of dropping
+    # the asset; honour Retry-After on 429/503 responses
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET', 'POST'],
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    # Self-hosted n8n webhooks are often plain http
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    return session
+
+SESSION = create_session()
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+def json_loads(data: bytes):
+    """Decode JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Encode an object to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def parse_csv(data: bytes) -> List[Dict]:
+    """Parse a Socrata CSV response into a list of row dicts."""
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8'))))
+
+def file_mode(path: str) -> int:
+    """Permissions for path: the existing file's mode, else 0666 minus the umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def atomic_write(path: str, data: bytes):
+    """Write bytes to a temp file next to path, then move it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates 0600 files; give the target its normal permissions
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+@functools.lru_cache(maxsize=1)
 def load_config() -> Dict:
-    """Load configuration from file or use defaults."""
+    """Load configuration from file or use defaults. Parsed once per process."""
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                print(f"✓ Loaded configuration from {CONFIG_FILE}")
+            with open(CONFIG_FILE, 'rb') as f:
+                config = json_loads(f.read())
+                logger.info("✓ Loaded configuration from %s", CONFIG_FILE)
                 return config
         except Exception as e:
-            print(f"⚠ Error loading config file: {e}")
-            print("Using default configuration")
+            logger.warning("⚠ Error loading config file: %s", e)
+            logger.warning("Using default configuration")
     else:
-        print(f"⚠ Config file not found. Creating {CONFIG_FILE} with defaults...")
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(DEFAULT_CONFIG, f, indent=2)
-        print(f"✓ Created {CONFIG_FILE}. Please update webhook URL.")
+        logger.warning("⚠ Config file not found. Creating %s with defaults...", CONFIG_FILE)
+        atomic_write(CONFIG_FILE, json_dumps(DEFAULT_CONFIG, indent=True))
+        logger.info("✓ Created %s. Please update webhook URL.", CONFIG_FILE)
     
     return DEFAULT_CONFIG
 
+def soql_quote(value: str) -> str:
+    """Quote a string literal for a SoQL query."""
+    return "'" + value.replace("'", "''") + "'"
+
 def fetch_cot_data(contract_name: str, limit: int = 156) -> Optional[List[Dict]]:
     """
     Fetch COT data from CFTC Socrata API.
@@ -94,50 +210,339 @@ def fetch_cot_data(contract_name: str, limit: int = 156) -> Optional[List[Dict]]
     """
     try:
         params = {
-            "$select": "report_date_as_yyyy_mm_dd,contract_market_name,lev_money_positions_long,lev_money_positions_short,nonrept_positions_long_all,nonrept_positions_short_all",
-            "$where": f"contract_market_name='{contract_name}'",
+            "$select": COT_FIELDS,
+            "$where": f"contract_market_name={soql_quote(contract_name)}",
             "$order": "report_date_as_yyyy_mm_dd DESC",
             "$limit": limit
         }
         
-        print(f"  Fetching {contract_name}...")
-        response = requests.get(CFTC_API_URL, params=params, timeout=30)
+        logger.info("  Fetching %s...", contract_name)
+        response = SESSION.get(CFTC_API_URL, params=params, timeout=30)
         response.raise_for_status()
         
-        data = response.json()
-        print(f"  ✓ Retrieved {len(data)} weeks of data")
+        data = parse_csv(response.content)
+        logger.info("  ✓ Retrieved %s weeks of data", len(data))
         return data
         
     except Exception as e:
-        print(f"  ✗ Error fetching {contract_name}: {e}")
+        logger.error("  ✗ Error fetching %s: %s", contract_name, e)
         return None
 
-def calculate_net_positions(data: List[Dict]) -> List[Dict]:
-    """Calculate net hedge fund and retail positions."""
-    processed = []
+def fetch_cot_data_batch(contract_names: List[str], limit_per: int = 156) -> Dict[str, List[Dict]]:
+    """
+    Fetch COT data for several contracts in a single Socrata query.
+    Returns records grouped by contract name, newest first.
+    Contracts the batch could not fully cover are left out so the
+    caller can fall back to fetch_cot_data for them.
+    """
+    if not contract_names:
+        return {}
+    
+    limit = len(contract_names) * limit_per
+    try:
+        params = {
+            "$select": COT_FIELDS,
+            "$where": f"contract_market_name in({', '.join(soql_quote(name) for name in contract_names)})",
+            "$order": "report_date_as_yyyy_mm_dd DESC",
+            "$limit": limit
+        }
+        
+        logger.info("  Fetching %s contracts in one batch...", len(contract_names))
+        response = SESSION.get(CFTC_API_URL, params=params, timeout=30)
+        response.raise_for_status()
+        
+        data = parse_csv(response.content)
+        
+    except Exception as e:
+        logger.error("  ✗ Batch fetch failed: %s", e)
+        return {}
     
+    grouped = {}
     for record in data:
+        grouped.setdefault(record.get('contract_market_name'), []).append(record)
+    
+    # A response that hit the overall limit may have cut short contracts with fewer rows
+    truncated = len(data) >= limit
+    result = {}
+    for name in contract_names:
+        records = grouped.get(name, [])[:limit_per]
+        if records and (len(records) == limit_per or not truncated):
+            result[name] = records
+    
+    logger.info("  ✓ Retrieved %s records for %s contracts", len(data), len(result))
+    return result
+
+def fetch_latest_report_dates(contract_names: List[str]) -> Dict[str, str]:
+    """
+    Fetch the most recent report date for each contract in one
+    aggregate query. Returns an empty dict on failure.
+    """
+    if not contract_names:
+        return {}
+    
+    try:
+        params = {
+            "$select": "contract_market_name,max(report_date_as_yyyy_mm_dd) AS latest_date",
+            "$where": f"contract_market_name in({', '.join(soql_quote(name) for name in contract_names)})",
+            "$group": "contract_market_name"
+        }
+        
+        response = SESSION.get(CFTC_API_URL, params=params, timeout=30)
+        response.raise_for_status()
+        
+        return {
+            row['contract_market_name']: row['latest_date']
+            for row in parse_csv(response.content)
+            if row.get('latest_date')
+        }
+        
+    except Exception as e:
+        logger.warning("  ⚠ Could not check latest report dates: %s", e)
+        return {}
+
+def cache_path(asset_config: Dict) -> str:
+    """Path of the cached API response for an asset."""
+    return os.path.join(CACHE_DIR, f"{asset_config['cftc_code']}.json")
+
+def load_cached_data(asset_config: Dict, latest_date: Optional[str], limit: int) -> Optional[List[Dict]]:
+    """
+    Load cached records for an asset if they are still current, i.e. they
+    belong to the asset's contract, the newest cached week matches the
+    latest report date and the cache was fetched with at least the
+    requested limit. Anything unexpected counts as a cache miss.
+    """
+    path = cache_path(asset_config)
+    if not latest_date or not os.path.exists(path):
+        return None
+    
+    try:
+        with open(path, 'rb') as f:
+            cached = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(cached, dict):
+        return None
+    
+    records = cached.get('records')
+    if not isinstance(records, list) or not records or not isinstance(records[0], dict):
+        return None
+    if cached.get('limit', 0) < limit:
+        return None
+    
+    # Every contract shares the weekly report date, so also make sure the
+    # cached rows belong to the contract currently configured for the asset
+    newest = records[0]
+    if newest.get('contract_market_name') != asset_config['contract_name']:
+        return None
+    if newest.get('report_date_as_yyyy_mm_dd') != latest_date:
+        return None
+    
+    return records[:limit]
+
+def save_cached_data(asset_config: Dict, records: List[Dict], limit: int):
+    """Write freshly fetched records for an asset to the cache."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        atomic_write(cache_path(asset_config), json_dumps({'limit': limit, 'records': records}))
+    except OSError as e:
+        logger.warning("  ⚠ Could not cache %s: %s", asset_config['contract_name'], e)
+
+def fetch_assets_data(assets: Dict, limit: int = 156) -> Dict[str, Optional[List[Dict]]]:
+    """
+    Get COT records for every asset, keyed by contract name.
+    Serves current data from the local cache, fetches the rest in one
+    batched query and falls back to per-contract queries if needed.
+    """
+    contract_names = list(dict.fromkeys(cfg['contract_name'] for cfg in assets.values()))
+    
+    logger.info("📥 Fetching COT data...")
+    latest_dates = fetch_latest_report_dates(contract_names)
+    
+    records_by_contract = {}
+    for asset_config in assets.values():
+        name = asset_config['contract_name']
+        cached = load_cached_data(asset_config, latest_dates.get(name), limit)
+        if cached:
+            records_by_contract[name] = cached
+    
+    if records_by_contract:
+        logger.info("  ✓ Loaded %s contracts from cache", len(records_by_contract))
+    
+    stale = [name for name in contract_names if name not in records_by_contract]
+    fresh = fetch_cot_data_batch(stale, limit_per=limit)
+    
+    # Fall back to per-contract queries for anything the batch missed
+    missing = [name for name in stale if name not in fresh]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(missing))) as executor:
+            futures = {
+                executor.submit(fetch_cot_data, name, limit): name
+                for name in missing
+            }
+            for future in as_completed(futures):
+                fresh[futures[future]] = future.result()
+    
+    for asset_config in assets.values():
+        records = fresh.get(asset_config['contract_name'])
+        if records:
+            save_cached_data(asset_config, records, limit)
+    
+    records_by_contract.update(fresh)
+    return records_by_contract
+
+def calculate_net_positions(data: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Calculate net hedge fund and retail positions.
+    Returns parallel arrays keyed by field, newest first.
+    """
+    records = [record for record in data if record.get('report_date_as_yyyy_mm_dd')]
+    fields = (
+        'lev_money_positions_long',
+        'lev_money_positions_short',
+        'nonrept_positions_long_all',
+        'nonrept_positions_short_all'
+    )
+    
+    # Gather each column as raw strings and let NumPy convert them in C;
+    # empty or missing cells count as 0
+    def columns() -> List[np.ndarray]:
+        return [
+            np.array([record.get(field) or 0 for record in records], dtype=np.float64)
+            for field in fields
+        ]
+    
+    def is_valid(record: Dict) -> bool:
         try:
-            hf_long = float(record.get('lev_money_positions_long', 0))
-            hf_short = float(record.get('lev_money_positions_short', 0))
-            retail_long = float(record.get('nonrept_positions_long_all', 0))
-            retail_short = float(record.get('nonrept_positions_short_all', 0))
+            for field in fields:
+                float(record.get(field) or 0)
+            return True
+        except ValueError:
+            return False
+    
+    try:
+        hf_long, hf_short, retail_long, retail_short = columns()
+    except ValueError:
+        # Drop only the malformed rows and convert the rest
+        valid = [record for record in records if is_valid(record)]
+        logger.warning("  ⚠ Skipped %s malformed records", len(records) - len(valid))
+        records = valid
+        hf_long, hf_short, retail_long, retail_short = columns()
+    
+    return {
+        'date': [record['report_date_as_yyyy_mm_dd'] for record in records],
+        'hf_net': hf_long - hf_short,
+        'retail_net': retail_long - retail_short,
+        'hf_long': hf_long,
+        'hf_short': hf_short
+    }
+
+def rolling_minmax(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling minimum and maximum over a trailing window of `window` points.
+    Uses monotonic deques of indices, so the whole series costs O(n)
+    regardless of window size. values must be in chronological order.
+    Groundwork for rolling signal history; point-in-time extremes in
+    detect_signals use plain reductions.
+    
+    >>> rolling_minmax(np.array([3.0, 1.0, 2.0, 5.0]), 2)
+    (array([3., 1., 1., 2.]), array([3., 3., 2., 5.]))
+    """
+    series = values.tolist()
+    lows = np.empty(len(series), dtype=np.float64)
+    highs = np.empty(len(series), dtype=np.float64)
+    min_idx = deque()  # indices with increasing values
+    max_idx = deque()  # indices with decreasing values
+    
+    for i, value in enumerate(series):
+        while min_idx and series[min_idx[-1]] >= value:
+            min_idx.pop()
+        min_idx.append(i)
+        while max_idx and series[max_idx[-1]] <= value:
+            max_idx.pop()
+        max_idx.append(i)
+        
+        # Drop indices that slid out of the window
+        if min_idx[0] <= i - window:
+            min_idx.popleft()
+        if max_idx[0] <= i - window:
+            max_idx.popleft()
+        
+        lows[i] = series[min_idx[0]]
+        highs[i] = series[max_idx[0]]
+    
+    return lows, highs
+
+# Divergence kernels specialized per (divergence_weeks, recent_window, older_window)
+_DETECTORS = {}
+
+def _make_detector(divergence_weeks: int, recent_window: int, older_window: int):
+    """
+    Build (or reuse) a divergence kernel for fixed window sizes. The sizes
+    are closed over, so Numba compiles them in as constants.
+    
+    The kernel reduces the net position series (newest first) to
+    (recent_low, older_low, recent_high, older_high, divergence_ref)
+    in a single pass. divergence_ref is the oldest week of the divergence
+    period.
+    """
+    key = (divergence_weeks, recent_window, older_window)
+    if key in _DETECTORS:
+        return _DETECTORS[key]
+    
+    @njit(cache=True)
+    def detector(hf_nets: np.ndarray) -> tuple:
+        divergence_len = min(divergence_weeks, len(hf_nets))
+        
+        # Windows counted back from the newest week, capped by the divergence
+        # period: recent is [0, recent_window), older follows right after it
+        recent_end = min(recent_window, divergence_len)
+        older_end = min(recent_window + older_window, divergence_len)
+        
+        recent_low = older_low = np.inf
+        recent_high = older_high = -np.inf
+        
+        for i in range(older_end):
+            value = hf_nets[i]
             
-            processed.append({
-                'date': record['report_date_as_yyyy_mm_dd'],
-                'hf_net': hf_long - hf_short,
-                'retail_net': retail_long - retail_short,
-                'hf_long': hf_long,
-                'hf_short': hf_short
-            })
-        except (KeyError, ValueError) as e:
-            continue
-    
-    return processed
-
-def detect_signals(data: List[Dict], divergence_weeks: int = 52, extreme_weeks: int = 156) -> Dict:
+            if i < recent_end:
+                recent_low = min(recent_low, value)
+                recent_high = max(recent_high, value)
+            else:
+                older_low = min(older_low, value)
+                older_high = max(older_high, value)
+        
+        return (
+            recent_low,
+            older_low,
+            recent_high,
+            older_high,
+            hf_nets[divergence_len - 1]
+        )
+    
+    _DETECTORS[key] = detector
+    return detector
+
+# Status labels by signal bit: extreme_bearish (0), extreme_bullish (1),
+# bearish_divergence (2), bullish_divergence (3)
+SIGNAL_LABELS = [
+    "⚠️ EXTREME BEARISH",
+    "⚠️ EXTREME BULLISH",
+    "🔥 BEARISH DIVERGENCE",
+    "🔥 BULLISH DIVERGENCE"
+]
+
+# Status for every 4-bit signal code; the highest set bit takes priority
+STATUS_TABLE = ["NEUTRAL"] + [SIGNAL_LABELS[code.bit_length() - 1] for code in range(1, 16)]
+
+def detect_signals(data: Dict[str, np.ndarray], divergence_weeks: int = 52, extreme_weeks: int = 156,
+                   recent_window: int = 26, older_window: int = 26) -> Dict:
     """
     Detect divergences and extreme positioning.
+    Divergences compare the newest `recent_window` weeks against the
+    `older_window` weeks before them. Both windows are capped at
+    `divergence_weeks`; weeks older than recent_window + older_window are
+    not used for the high/low comparison.
     
     Returns:
     {
@@ -149,7 +554,9 @@ def detect_signals(data: List[Dict], divergence_weeks: int = 52, extreme_weeks:
         'status': str
     }
     """
-    if len(data) < 2:
+    hf_nets = data['hf_net']
+    
+    if len(hf_nets) < 2:
         return {
             'current_net': 0,
             'bullish_divergence': False,
@@ -159,84 +566,72 @@ def detect_signals(data: List[Dict], divergence_weeks: int = 52, extreme_weeks:
             'status': 'INSUFFICIENT_DATA'
         }
     
-    current = data[0]
-    current_net = current['hf_net']
+    current_net = hf_nets[0]
     
-    # Get lookback periods
-    divergence_data = data[:min(divergence_weeks, len(data))]
-    extreme_data = data[:min(extreme_weeks, len(data))]
+    # Calculate extremes over the lookback
+    extreme_nets = hf_nets[:extreme_weeks]
+    extreme_low = extreme_nets.min()
+    extreme_high = extreme_nets.max()
     
-    # Calculate extremes
-    hf_nets = [d['hf_net'] for d in extreme_data]
-    extreme_low = min(hf_nets)
-    extreme_high = max(hf_nets)
+    detector = _make_detector(divergence_weeks, recent_window, older_window)
+    recent_low, older_low, recent_high, older_high, divergence_ref = detector(hf_nets)
     
-    extreme_bullish = current_net == extreme_low  # HF at max bearish = contrarian buy
-    extreme_bearish = current_net == extreme_high  # HF at max bullish = contrarian sell
+    extreme_bullish = bool(current_net == extreme_low)  # HF at max bearish = contrarian buy
+    extreme_bearish = bool(current_net == extreme_high)  # HF at max bullish = contrarian sell
     
     # Detect divergences (simplified - would need price data for full implementation)
     # For now, detect if HF positioning is making higher lows or lower highs
-    divergence_nets = [d['hf_net'] for d in divergence_data]
     
     # Bullish divergence: HF making higher low
-    recent_low = min(divergence_nets[-26:])  # Last 6 months
-    older_low = min(divergence_nets[-52:-26])  # Previous 6 months
-    bullish_divergence = recent_low > older_low and current_net < divergence_nets[-1]
+    bullish_divergence = bool(recent_low > older_low and current_net < divergence_ref)
     
     # Bearish divergence: HF making lower high
-    recent_high = max(divergence_nets[-26:])
-    older_high = max(divergence_nets[-52:-26])
-    bearish_divergence = recent_high < older_high and current_net > divergence_nets[-1]
+    bearish_divergence = bool(recent_high < older_high and current_net > divergence_ref)
     
     # Determine status
-    if bullish_divergence:
-        status = "🔥 BULLISH DIVERGENCE"
-    elif bearish_divergence:
-        status = "🔥 BEARISH DIVERGENCE"
-    elif extreme_bullish:
-        status = "⚠️ EXTREME BULLISH"
-    elif extreme_bearish:
-        status = "⚠️ EXTREME BEARISH"
-    else:
-        status = "NEUTRAL"
+    signal_code = (
+        (bullish_divergence << 3) | (bearish_divergence << 2) |
+        (extreme_bullish << 1) | extreme_bearish
+    )
+    status = STATUS_TABLE[signal_code]
     
     return {
-        'current_net': round(current_net, 2),
-        'hf_long': round(current['hf_long'], 2),
-        'hf_short': round(current['hf_short'], 2),
+        'current_net': round(float(current_net), 2),
+        'hf_long': round(float(data['hf_long'][0]), 2),
+        'hf_short': round(float(data['hf_short'][0]), 2),
         'bullish_divergence': bullish_divergence,
         'bearish_divergence': bearish_divergence,
         'extreme_bullish': extreme_bullish,
         'extreme_bearish': extreme_bearish,
         'status': status,
-        'date': current['date']
+        'date': data['date'][0]
     }
 
-def analyze_asset(asset_code: str, asset_config: Dict, lookback_config: Dict) -> Optional[Dict]:
-    """Analyze single asset and return signals."""
-    print(f"\n📊 Analyzing {asset_config['name']} ({asset_code})...")
-    
-    data = fetch_cot_data(
-        asset_config['contract_name'],
-        limit=lookback_config['extreme_weeks']
-    )
+def analyze_asset(asset_code: str, asset_config: Dict, lookback_config: Dict,
+                  data: Optional[List[Dict]]) -> Optional[Dict]:
+    """Analyze single asset from its fetched records and return signals."""
+    logger.info("\n📊 Analyzing %s (%s)...", asset_config['name'], asset_code)
     
     if not data:
+        logger.error("  ✗ No data returned for %s", asset_code)
         return None
     
     processed = calculate_net_positions(data)
-    if not processed:
-        print(f"  ✗ No valid data for {asset_code}")
+    if not processed['date']:
+        logger.error("  ✗ No valid data for %s", asset_code)
         return None
     
     signals = detect_signals(
         processed,
         divergence_weeks=lookback_config['divergence_weeks'],
-        extreme_weeks=lookback_config['extreme_weeks']
+        extreme_weeks=lookback_config['extreme_weeks'],
+        recent_window=lookback_config.get('recent_window', 26),
+        older_window=lookback_config.get('older_window', 26)
     )
     
-    print(f"  Status: {signals['status']}")
-    print(f"  HF Net: {signals['current_net']:,.0f}")
+    logger.info("  Status: %s", signals['status'])
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("  HF Net: %s", format(signals['current_net'], ',.0f'))
     
     return {
         'asset_code': asset_code,
@@ -245,23 +640,26 @@ def analyze_asset(asset_code: str, asset_config: Dict, lookback_config: Dict) ->
     }
 
 def send_to_webhook(data: Dict, webhook_url: str) -> bool:
-    """Send report data to n8n webhook."""
+    """Send report data to n8n webhook as gzip-compressed JSON."""
     try:
-        print(f"\n📤 Sending to webhook: {webhook_url}")
+        logger.info("\n📤 Sending to webhook: %s", webhook_url)
         
-        response = requests.post(
+        response = SESSION.post(
             webhook_url,
-            json=data,
-            headers={'Content-Type': 'application/json'},
+            data=gzip.compress(json_dumps(data)),
+            headers={
+                'Content-Type': 'application/json',
+                'Content-Encoding': 'gzip'
+            },
             timeout=30
         )
         response.raise_for_status()
         
-        print("✓ Webhook delivered successfully")
+        logger.info("✓ Webhook delivered successfully")
         return True
         
     except Exception as e:
-        print(f"✗ Webhook failed: {e}")
+        logger.error("✗ Webhook failed: %s", e)
         return False
 
 # ============================================================================
@@ -270,10 +668,15 @@ def send_to_webhook(data: Dict, webhook_url: str) -> bool:
 
 def main():
     """Main execution flow."""
-    print("=" * 70)
-    print("COT SMART MONEY MONITOR")
-    print("=" * 70)
-    print(f"Run time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    # Capture the run time once so every timestamp in the report agrees
+    now = datetime.now()
+    today_str = now.strftime('%Y-%m-%d')
+    today_compact = now.strftime('%Y%m%d')
+    
+    logger.info("=" * 70)
+    logger.info("COT SMART MONEY MONITOR")
+    logger.info("=" * 70)
+    logger.info("Run time: %s %s\n", today_str, now.strftime('%H:%M:%S'))
     
     # Load configuration
     config = load_config()
@@ -281,18 +684,22 @@ def main():
     # Validate webhook URL
     webhook_url = config.get('n8n_webhook_url', '')
     if 'your-n8n-instance' in webhook_url:
-        print("\n⚠️  WARNING: Please update webhook URL in config.json")
-        print("Current URL is placeholder. Script will continue but webhook will fail.\n")
+        logger.warning("\n⚠️  WARNING: Please update webhook URL in config.json")
+        logger.warning("Current URL is placeholder. Script will continue but webhook will fail.\n")
     
     # Analyze all assets
     results = []
     active_signals = []
     
-    for asset_code, asset_config in config['assets'].items():
+    assets = config['assets']
+    records_by_contract = fetch_assets_data(assets, limit=config['lookback']['extreme_weeks'])
+    
+    for asset_code, asset_config in assets.items():
         analysis = analyze_asset(
             asset_code,
             asset_config,
-            config['lookback']
+            config['lookback'],
+            records_by_contract.get(asset_config['contract_name'])
         )
         
         if analysis:
@@ -308,8 +715,8 @@ def main():
     
     # Prepare report payload
     report = {
-        'timestamp': datetime.now().isoformat(),
-        'week_ending': datetime.now().strftime('%Y-%m-%d'),
+        'timestamp': now.isoformat(),
+        'week_ending': today_str,
         'total_assets': len(results),
         'active_signals': len(active_signals),
         'signals': active_signals,
@@ -317,42 +724,48 @@ def main():
     }
     
     # Print summary
-    print("\n" + "=" * 70)
-    print("SUMMARY")
-    print("=" * 70)
-    print(f"Assets analyzed: {len(results)}")
-    print(f"Active signals: {len(active_signals)}")
+    logger.info("\n" + "=" * 70)
+    logger.info("SUMMARY")
+    logger.info("=" * 70)
+    logger.info("Assets analyzed: %s", len(results))
+    logger.info("Active signals: %s", len(active_signals))
     
     if active_signals:
-        print("\n🚨 ACTIVE SIGNALS:")
+        logger.info("\n🚨 ACTIVE SIGNALS:")
         for signal in active_signals:
-            print(f"  • {signal['asset']}: {signal['signal']}")
+            logger.info("  • %s: %s", signal['asset'], signal['signal'])
     else:
-        print("\nNo active signals this week.")
+        logger.info("\nNo active signals this week.")
     
     # Save report locally
-    report_file = f"cot_report_{datetime.now().strftime('%Y%m%d')}.json"
-    with open(report_file, 'w') as f:
-        json.dump(report, f, indent=2)
-    print(f"\n💾 Report saved: {report_file}")
+    report_file = f"cot_report_{today_compact}.json.gz"
+    atomic_write(report_file, gzip.compress(json_dumps(report, indent=True), compresslevel=6))
+    logger.info("\n💾 Report saved: %s", report_file)
     
     # Send to webhook
     if webhook_url and 'your-n8n-instance' not in webhook_url:
         send_to_webhook(report, webhook_url)
     else:
-        print("\n⚠️  Skipping webhook (URL not configured)")
+        logger.warning("\n⚠️  Skipping webhook (URL not configured)")
     
-    print("\n✓ Analysis complete!")
-    print("=" * 70)
+    logger.info("\n✓ Analysis complete!")
+    logger.info("=" * 70)
 
 if __name__ == "__main__":
+    log_level = (os.environ.get('COT_LOG') or 'INFO').upper()
+    valid_level = isinstance(logging.getLevelName(log_level), int)
+    logging.basicConfig(
+        level=log_level if valid_level else logging.INFO,
+        format='%(message)s',
+        stream=sys.stdout
+    )
+    if not valid_level:
+        logger.warning("⚠ Unknown COT_LOG level %r, using INFO", os.environ['COT_LOG'])
     try:
         main()
     except KeyboardInterrupt:
-        print("\n\n⚠️  Interrupted by user")
+        logger.warning("\n\n⚠️  Interrupted by user")
         sys.exit(0)
     except Exception as e:
-        print(f"\n\n✗ Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("\n\n✗ Fatal error: %s", e)
         sys.exit(1)